@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""Builds reports/Test_Report.md by running memsim.py over bundled traces.
+
+Each trace is exercised under every (algorithm, frames) case and the
+captured output is assembled into one markdown report. Cases for
+different traces are independent, so they run in parallel worker
+processes; the report itself is emitted in deterministic trace order.
+"""
+
+import hashlib
+import io
+import json
+import os
+import subprocess
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+
+TRACES = {
+    "small_mixed.trace": (
+        "R 0x1000\n"
+        "W 0x2345\n"
+        "R 0x3000\n"
+        "W 0x1fff\n"
+        "R 0x4000\n"
+        "R 0x5000\n"
+        "W 0x2345\n"
+        "R 0x1000\n"
+    ),
+    "sequential.trace": "".join(
+        f"R 0x{page << 12:x}\n" for page in range(1, 33)
+    ),
+    "tight_loop.trace": "".join(
+        f"{op} 0x{(page % 3 + 1) << 12:x}\n"
+        for page in range(30)
+        for op in ("R", "W")
+    ),
+}
+
+CASES = [("lru", 2), ("lru", 4), ("clock", 2), ("clock", 4)]
+
+
+_HASH_CACHE = Path.home() / ".cache" / "memsim-report" / "hash.json"
+
+
+def sha256_file(path):
+    """sha256 of a file, cached on (path, mtime, size) across runs."""
+    st = os.stat(path)
+    key = str(path)
+    stamp = [st.st_mtime, st.st_size]
+    try:
+        cache = json.loads(_HASH_CACHE.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        cache = {}
+    entry = cache.get(key)
+    if entry and entry[:2] == stamp:
+        return entry[2]
+    with open(path, "rb") as f:
+        try:
+            digest = hashlib.file_digest(f, "sha256").hexdigest()
+        except AttributeError:  # Python < 3.11
+            h = hashlib.sha256()
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+            digest = h.hexdigest()
+    cache[key] = stamp + [digest]
+    try:
+        _HASH_CACHE.parent.mkdir(parents=True, exist_ok=True)
+        _HASH_CACHE.write_text(json.dumps(cache), encoding="utf-8")
+    except OSError:
+        pass
+    return digest
+
+
+def run_case(python, memsim, name, text, out_dir):
+    """Run every case over one trace; returns (algorithm, frames, cmd, output)."""
+    trace_path = Path(out_dir) / "traces" / name
+    trace_path.parent.mkdir(parents=True, exist_ok=True)
+    trace_path.write_text(text, encoding="utf-8")
+    runs = []
+    for algorithm, frames in CASES:
+        cmd = [python, memsim, str(trace_path), str(frames), algorithm]
+        proc = subprocess.run(cmd, capture_output=True, text=True, check=True)
+        runs.append((algorithm, frames, " ".join(cmd), proc.stdout))
+    return runs
+
+
+def main():
+    out_dir = HERE / "reports"
+    out_dir.mkdir(exist_ok=True)
+    memsim = str(HERE / "memsim.py")
+    python = sys.executable
+    with ProcessPoolExecutor() as ex:
+        futs = {
+            ex.submit(run_case, python, memsim, name, TRACES[name],
+                      str(out_dir)): name
+            for name in TRACES
+        }
+        results = {futs[f]: f.result() for f in as_completed(futs)}
+    case_tmpl = (
+        "## Case: {name}\n\n"
+        "**Trace (`traces/{name}`)**\n\n"
+        "```\n{trace}```\n\n"
+    )
+    run_tmpl = (
+        "### {algorithm}, {frames} frames\n\n"
+        "**Command:** `{cmd}`\n\n"
+        "```\n{output}```\n\n"
+    )
+    buf = io.StringIO()
+    w = buf.write
+    w("# memsim Test Report\n\n")
+    w(f"`memsim.py` sha256: `{sha256_file(memsim)}`\n\n")
+    for name, trace in TRACES.items():
+        w(case_tmpl.format(name=name, trace=trace))
+        for algorithm, frames, cmd, output in results[name]:
+            w(run_tmpl.format(algorithm=algorithm, frames=frames,
+                              cmd=cmd, output=output))
+    report = out_dir / "Test_Report.md"
+    report.write_text(buf.getvalue(), encoding="utf-8")
+    print(f"wrote {report}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,592 @@
+#!/usr/bin/env python3
+"""Virtual memory page replacement simulator.
+
+Reads a memory-reference trace (one operation + hex address per line)
+and simulates a physical memory of N frames under LRU or CLOCK
+replacement, reporting disk reads (page faults), disk writes (dirty
+evictions) and the page fault rate.
+
+Usage:
+    python3 memsim.py TRACEFILE FRAMES [lru|clock] [quiet|debug]
+
+If numba and numpy are installed, the trace is parsed into arrays up
+front and the whole simulation runs inside a compiled kernel; otherwise
+a pure-Python fallback processes the trace line by line.
+"""
+
+import hashlib
+import mmap
+import os
+import re
+import sys
+from array import array
+from binascii import unhexlify
+from collections import OrderedDict
+
+try:
+    import numpy as np
+    from numba import njit
+    _HAVE_NUMBA = True
+except ImportError:  # numba/numpy are optional accelerators
+    np = None
+    _HAVE_NUMBA = False
+
+try:
+    from _memsim_ext import simulate_clock_c
+except ImportError:  # extension not built; pure-Python ClockSim is used
+    simulate_clock_c = None
+
+PAGE_SIZE = 4096
+PAGE_SHIFT = 12
+assert PAGE_SIZE == 1 << PAGE_SHIFT
+
+
+class LRUSim:
+    """LRU replacement over an OrderedDict of resident frames.
+
+    Readable reference implementation; simulate() runs LRUArraySim,
+    which keeps the recency list in flat int arrays instead.
+    """
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.frames = OrderedDict()  # page -> dirty bit (0/1), LRU first
+        self.events = 0
+        self.disk_reads = 0
+        self.disk_writes = 0
+
+    def access(self, op, addr):
+        page = addr >> PAGE_SHIFT
+        if op == 'W':
+            self._access_write(page)
+        else:
+            self._access_read(page)
+
+    def _access_read(self, page):
+        self.events += 1
+        frames = self.frames
+        if page in frames:
+            frames.move_to_end(page)
+            return
+        self.disk_reads += 1
+        if len(frames) >= self.capacity:
+            _, evict_dirty = frames.popitem(last=False)
+            if evict_dirty:
+                self.disk_writes += 1
+        frames[page] = 0
+
+    def _access_write(self, page):
+        self.events += 1
+        frames = self.frames
+        if page in frames:
+            frames[page] = 1
+            frames.move_to_end(page)
+            return
+        self.disk_reads += 1
+        if len(frames) >= self.capacity:
+            _, evict_dirty = frames.popitem(last=False)
+            if evict_dirty:
+                self.disk_writes += 1
+        frames[page] = 1
+
+
+class LRUArraySim:
+    """LRU with the recency list hand-rolled over flat int arrays.
+
+    Resident slots form a doubly-linked list through nextyounger /
+    nextolder arrays with oldest/youngest end pointers, so a hit or an
+    eviction is a handful of int stores with no OrderedDict bookkeeping
+    and ~24 bytes per frame. The page->slot map stays a plain dict; the
+    compiled kernels carry the open-addressing equivalent.
+    """
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.slot_page = array('q', [-1] * capacity)
+        self.dirty = bytearray(capacity)
+        self.nextyounger = array('q', [-1] * capacity)
+        self.nextolder = array('q', [-1] * capacity)
+        self.oldest = -1
+        self.youngest = -1
+        self.loc = {}  # page -> slot index
+        self.used = 0
+        self.events = 0
+        self.disk_reads = 0
+        self.disk_writes = 0
+
+    def access(self, op, addr):
+        page = addr >> PAGE_SHIFT
+        if op == 'W':
+            self._access_write(page)
+        else:
+            self._access_read(page)
+
+    def _touch(self, idx):
+        if idx == self.youngest:
+            return
+        younger = self.nextyounger[idx]
+        older = self.nextolder[idx]
+        if older != -1:
+            self.nextyounger[older] = younger
+        else:
+            self.oldest = younger
+        self.nextolder[younger] = older
+        self.nextolder[idx] = self.youngest
+        self.nextyounger[idx] = -1
+        self.nextyounger[self.youngest] = idx
+        self.youngest = idx
+
+    def _access_read(self, page):
+        self.events += 1
+        idx = self.loc.get(page, -1)
+        if idx != -1:
+            self._touch(idx)
+            return
+        self._fault(page, 0)
+
+    def _access_write(self, page):
+        self.events += 1
+        idx = self.loc.get(page, -1)
+        if idx != -1:
+            self.dirty[idx] = 1
+            self._touch(idx)
+            return
+        self._fault(page, 1)
+
+    def _fault(self, page, dirty):
+        self.disk_reads += 1
+        if self.used < self.capacity:
+            idx = self.used
+            self.used += 1
+        else:
+            idx = self.oldest
+            if self.dirty[idx]:
+                self.disk_writes += 1
+            del self.loc[self.slot_page[idx]]
+            self.oldest = self.nextyounger[idx]
+            if self.oldest != -1:
+                self.nextolder[self.oldest] = -1
+            else:
+                self.youngest = -1
+        self.slot_page[idx] = page
+        self.dirty[idx] = dirty
+        self.nextolder[idx] = self.youngest
+        self.nextyounger[idx] = -1
+        if self.youngest != -1:
+            self.nextyounger[self.youngest] = idx
+        else:
+            self.oldest = idx
+        self.youngest = idx
+        self.loc[page] = idx
+
+
+class ClockSim:
+    """CLOCK (second chance) replacement with an O(1) page->slot index."""
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.pages = array('q', [-1] * capacity)
+        self.refbit = bytearray(capacity)
+        self.dirty = bytearray(capacity)
+        self.loc = {}  # page -> slot index
+        self.hand = 0
+        self.used = 0
+        self.events = 0
+        self.disk_reads = 0
+        self.disk_writes = 0
+
+    def access(self, op, addr):
+        page = addr >> PAGE_SHIFT
+        if op == 'W':
+            self._access_write(page)
+        else:
+            self._access_read(page)
+
+    def _access_read(self, page):
+        self.events += 1
+        idx = self.loc.get(page, -1)
+        if idx != -1:
+            self.refbit[idx] = 1
+            return
+        self._fault(page, 0)
+
+    def _access_write(self, page):
+        self.events += 1
+        idx = self.loc.get(page, -1)
+        if idx != -1:
+            self.refbit[idx] = 1
+            self.dirty[idx] = 1
+            return
+        self._fault(page, 1)
+
+    def _fault(self, page, dirty):
+        self.disk_reads += 1
+        refbit = self.refbit
+        if self.used < self.capacity:
+            victim = self.used
+            self.used += 1
+        else:
+            hand = self.hand
+            capacity = self.capacity
+            while refbit[hand]:
+                refbit[hand] = 0
+                hand = (hand + 1) % capacity
+            victim = hand
+            self.hand = (victim + 1) % capacity
+            if self.dirty[victim]:
+                self.disk_writes += 1
+            del self.loc[self.pages[victim]]
+        self.pages[victim] = page
+        refbit[victim] = 1
+        self.dirty[victim] = dirty
+        self.loc[page] = victim
+
+
+# One pattern covers both line orderings and, with its (?im) flags, also
+# drives the whole-trace finditer passes; matching it at the start of a
+# single line is what parse_line does.
+_TRACE_RE = re.compile(
+    rb'(?im)^\s*(?:([RWLSM])[\s,]+(?:0x)?([0-9a-fA-F]+)'
+    rb'|([0-9a-fA-F]{4,})[\s,]+([RWLSM]))')
+
+
+def parse_line(line):
+    """Parse one trace line into (op, addr) or None if it has neither.
+
+    Operates on bytes so mmap'd input never needs decoding. Accepts
+    "OP ADDR" and "ADDR OP" orderings; OP is one of R/L (read) or
+    W/S/M (write), case-insensitive.
+    """
+    m = _TRACE_RE.match(line)
+    if not m:
+        return None
+    op, addr_hex = m.group(1), m.group(2)
+    if op is None:
+        addr_hex, op = m.group(3), m.group(4)
+    if len(addr_hex) & 1:
+        addr_hex = b'0' + addr_hex
+    return ('W' if op in b'WSMwsm' else 'R',
+            int.from_bytes(unhexlify(addr_hex), 'big'))
+
+
+if _HAVE_NUMBA:
+    @njit(cache=True, boundscheck=False)
+    def _oa_get(keys, vals, mask, key):
+        """Look up key in a linear-probe hash; -1 if absent."""
+        h = key & mask
+        while True:
+            k = keys[h]
+            if k == key:
+                return vals[h]
+            if k == -1:
+                return -1
+            h = (h + 1) & mask
+
+    @njit(cache=True, boundscheck=False)
+    def _oa_put(keys, vals, mask, key, val):
+        h = key & mask
+        while keys[h] != -1 and keys[h] != key:
+            h = (h + 1) & mask
+        keys[h] = key
+        vals[h] = val
+
+    @njit(cache=True, boundscheck=False)
+    def _oa_del(keys, vals, mask, key):
+        """Delete key using backward-shift so probe chains stay intact."""
+        h = key & mask
+        while keys[h] != key:
+            h = (h + 1) & mask
+        i = h
+        while True:
+            keys[i] = -1
+            j = i
+            while True:
+                j = (j + 1) & mask
+                if keys[j] == -1:
+                    return
+                ideal = keys[j] & mask
+                if (j - ideal) & mask >= (j - i) & mask:
+                    keys[i] = keys[j]
+                    vals[i] = vals[j]
+                    i = j
+                    break
+
+    @njit(cache=True, boundscheck=False)
+    def _clock_kernel(pages, ops, capacity):
+        slot_page = np.full(capacity, -1, np.int64)
+        refbit = np.zeros(capacity, np.uint8)
+        dirty = np.zeros_like(refbit)
+        tsize = 1
+        while tsize < 2 * capacity:
+            tsize <<= 1
+        mask = tsize - 1
+        loc_keys = np.full(tsize, -1, np.int64)
+        loc_vals = np.empty(tsize, np.int64)
+        hand = 0
+        used = 0
+        reads = 0
+        writes = 0
+        n = pages.shape[0]
+        for k in range(n):
+            pg = pages[k]
+            op = ops[k]
+            idx = _oa_get(loc_keys, loc_vals, mask, pg)
+            if idx != -1:
+                refbit[idx] = 1
+                dirty[idx] |= op
+                continue
+            reads += 1
+            if used < capacity:
+                victim = used
+                used += 1
+            else:
+                while refbit[hand]:
+                    refbit[hand] = 0
+                    hand += 1
+                    if hand == capacity:
+                        hand = 0
+                victim = hand
+                hand += 1
+                if hand == capacity:
+                    hand = 0
+                if dirty[victim]:
+                    writes += 1
+                _oa_del(loc_keys, loc_vals, mask, slot_page[victim])
+            slot_page[victim] = pg
+            refbit[victim] = 1
+            dirty[victim] = op
+            _oa_put(loc_keys, loc_vals, mask, pg, victim)
+        return n, reads, writes
+
+    @njit(cache=True, boundscheck=False)
+    def _lru_kernel(pages, ops, capacity):
+        # Recency list as prev/next slot arrays: oldest/youngest ends,
+        # all link updates are a handful of int stores.
+        slot_page = np.full(capacity, -1, np.int64)
+        dirty = np.zeros(capacity, np.uint8)
+        prev = np.full(capacity, -1, np.int64)
+        nxt = np.full(capacity, -1, np.int64)
+        oldest = -1
+        youngest = -1
+        tsize = 1
+        while tsize < 2 * capacity:
+            tsize <<= 1
+        mask = tsize - 1
+        loc_keys = np.full(tsize, -1, np.int64)
+        loc_vals = np.empty(tsize, np.int64)
+        used = 0
+        reads = 0
+        writes = 0
+        n = pages.shape[0]
+        for k in range(n):
+            pg = pages[k]
+            op = ops[k]
+            idx = _oa_get(loc_keys, loc_vals, mask, pg)
+            if idx != -1:
+                dirty[idx] |= op
+                if idx != youngest:
+                    p = prev[idx]
+                    nx = nxt[idx]
+                    if p != -1:
+                        nxt[p] = nx
+                    else:
+                        oldest = nx
+                    prev[nx] = p
+                    prev[idx] = youngest
+                    nxt[idx] = -1
+                    nxt[youngest] = idx
+                    youngest = idx
+                continue
+            reads += 1
+            if used < capacity:
+                idx = used
+                used += 1
+            else:
+                idx = oldest
+                if dirty[idx]:
+                    writes += 1
+                _oa_del(loc_keys, loc_vals, mask, slot_page[idx])
+                oldest = nxt[idx]
+                if oldest != -1:
+                    prev[oldest] = -1
+                else:
+                    youngest = -1
+            slot_page[idx] = pg
+            dirty[idx] = op
+            prev[idx] = youngest
+            nxt[idx] = -1
+            if youngest != -1:
+                nxt[youngest] = idx
+            else:
+                oldest = idx
+            youngest = idx
+            _oa_put(loc_keys, loc_vals, mask, pg, idx)
+        return n, reads, writes
+
+
+def _default_cache_dir():
+    return os.path.join(os.path.expanduser('~'), '.cache', 'memsim')
+
+
+def _parse_arrays(trace_path, cache_dir=None):
+    """Parse the whole trace into (page, op) arrays for a batch kernel.
+
+    Parsed arrays are cached in an .npz sidecar keyed by a hash of the
+    trace bytes, so running several (algorithm, frames) configs over the
+    same trace only pays the parse once.
+    """
+    if cache_dir is None:
+        cache_dir = _default_cache_dir()
+    page_list = []
+    op_list = []
+    cache_path = None
+    with open(trace_path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                if cache_dir:
+                    trace_hash = hashlib.blake2b(mm).hexdigest()[:16]
+                    cache_path = os.path.join(cache_dir, trace_hash + '.npz')
+                    if os.path.exists(cache_path):
+                        cached = np.load(cache_path)
+                        return cached['p'], cached['o']
+                ap = page_list.append
+                ao = op_list.append
+                for m in _TRACE_RE.finditer(mm):
+                    op, addr_hex = m.group(1), m.group(2)
+                    if op is None:
+                        addr_hex, op = m.group(3), m.group(4)
+                    ap(int(addr_hex, 16) >> PAGE_SHIFT)
+                    ao(1 if op in b'WSMwsm' else 0)
+            finally:
+                mm.close()
+    pages = np.fromiter(page_list, np.int64, len(page_list))
+    ops = np.fromiter(op_list, np.uint8, len(op_list))
+    if cache_path is not None:
+        os.makedirs(cache_dir, exist_ok=True)
+        np.savez_compressed(cache_path, p=pages, o=ops)
+    return pages, ops
+
+
+def _open_trace_map(f):
+    """mmap an open trace file read-only; None if the file is empty."""
+    if os.fstat(f.fileno()).st_size == 0:
+        return None
+    return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _parse_buffers(trace_path):
+    """Parse the trace into (array('q') pages, bytearray ops) sans numpy."""
+    pages = array('q')
+    ops = bytearray()
+    with open(trace_path, 'rb') as f:
+        mm = _open_trace_map(f)
+        if mm is None:
+            return pages, ops
+        try:
+            ap = pages.append
+            ao = ops.append
+            for m in _TRACE_RE.finditer(mm):
+                op, addr_hex = m.group(1), m.group(2)
+                if op is None:
+                    addr_hex, op = m.group(3), m.group(4)
+                ap(int(addr_hex, 16) >> PAGE_SHIFT)
+                ao(1 if op in b'WSMwsm' else 0)
+        finally:
+            mm.close()
+    return pages, ops
+
+
+def simulate(trace_path, numframes, algorithm, mode='quiet', cache_dir=None):
+    sim = LRUArraySim(numframes) if algorithm == 'lru' else ClockSim(numframes)
+    if _HAVE_NUMBA and mode != 'debug':
+        pages, ops = _parse_arrays(trace_path, cache_dir)
+        events = pages.shape[0]
+        if events:
+            # coalesce runs of the same page before the kernel: a repeat
+            # access can only set the dirty bit, so folding the write
+            # flags forward leaves faults and dirty evictions unchanged
+            keep = np.empty(events, bool)
+            keep[0] = True
+            np.not_equal(pages[1:], pages[:-1], out=keep[1:])
+            starts = np.nonzero(keep)[0]
+            ops = np.logical_or.reduceat(ops, starts).astype(np.uint8)
+            pages = pages[keep]
+        kernel = _lru_kernel if algorithm == 'lru' else _clock_kernel
+        _, reads, writes = kernel(pages, ops, numframes)
+        sim.events = events
+        sim.disk_reads = reads
+        sim.disk_writes = writes
+    elif (algorithm == 'clock' and simulate_clock_c is not None
+          and mode != 'debug'):
+        pages, ops = _parse_buffers(trace_path)
+        events, reads, writes = simulate_clock_c(pages, ops, numframes)
+        sim.events = events
+        sim.disk_reads = reads
+        sim.disk_writes = writes
+    elif mode == 'debug':
+        # per-line parse_line path, kept for debug peeking
+        access = sim.access
+        with open(trace_path, 'rb') as f:
+            for line in f:
+                parsed = parse_line(line)
+                if parsed is None:
+                    continue
+                print(parsed[0], hex(parsed[1]))
+                access(*parsed)
+    else:
+        # pure-Python fallback: the trace regex runs straight over the
+        # mmap'd file and feeds the simulator, so neither a whole-file
+        # bytes copy nor per-line str objects are ever materialized.
+        # The op branch is resolved here once, into a bound-method pick.
+        dispatch = (sim._access_read, sim._access_write)
+        with open(trace_path, 'rb') as f:
+            mm = _open_trace_map(f)
+            if mm is not None:
+                try:
+                    for m in _TRACE_RE.finditer(mm):
+                        op, addr_hex = m.group(1), m.group(2)
+                        if op is None:
+                            addr_hex, op = m.group(3), m.group(4)
+                        dispatch[op in b'WSMwsm'](
+                            int(addr_hex, 16) >> PAGE_SHIFT)
+                finally:
+                    mm.close()
+    if os.environ.get('MEMSIM_QUIET'):
+        # bench mode: in-process callers read the stats off the sim
+        return sim
+    rate = sim.disk_reads / sim.events if sim.events else 0.0
+    sys.stdout.write(
+        f"total memory frames:  {numframes}\n"
+        f"events in trace:      {sim.events}\n"
+        f"total disk reads:     {sim.disk_reads}\n"
+        f"total disk writes:    {sim.disk_writes}\n"
+        f"page fault rate:      {rate:.4f}\n")
+    return sim
+
+
+def main(argv):
+    argv = list(argv)
+    cache_dir = None
+    if '--cache-dir' in argv:
+        i = argv.index('--cache-dir')
+        cache_dir = argv[i + 1]
+        del argv[i:i + 2]
+    if len(argv) < 4:
+        print(f"usage: {argv[0]} TRACEFILE FRAMES [lru|clock] [quiet|debug]"
+              f" [--cache-dir DIR]", file=sys.stderr)
+        return 1
+    trace_path = argv[1]
+    numframes = int(argv[2])
+    algorithm = argv[3]
+    if algorithm not in ('lru', 'clock'):
+        print(f"unknown algorithm: {algorithm}", file=sys.stderr)
+        return 1
+    mode = argv[4] if len(argv) > 4 else 'quiet'
+    simulate(trace_path, numframes, algorithm, mode, cache_dir)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""Practical 2: page replacement simulation over numeric page traces.
+
+The trace file contains one page number per line.  Two policies are
+implemented: LRU and CLOCK (second chance).
+
+Usage:
+    python3 memsim.py TRACEFILE FRAMES [lru|clock|both]
+"""
+
+import re
+import sys
+from array import array
+from collections import OrderedDict
+from dataclasses import dataclass
+
+
+@dataclass
+class Stats:
+    hits: int = 0
+    faults: int = 0
+    evictions: int = 0
+
+
+_PAGE_RE = re.compile(rb"(?m)^\s*(\d+)\s*$")
+
+
+def load_trace(path):
+    """Read a trace file of one page number per line into a list.
+
+    The whole file is read once and page numbers are extracted with a
+    single regex pass and batch int conversion; comment and blank lines
+    simply never match.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    return list(map(int, _PAGE_RE.findall(data)))
+
+
+def simulate_lru(pages, frames):
+    """Simulate LRU replacement over a page-number trace.
+
+    Recency is tracked by insertion order in an OrderedDict: a hit moves
+    the page to the MRU end, eviction pops the LRU end.  Both are O(1),
+    so per-reference cost is independent of the frame count.
+    """
+    stats = Stats()
+    od = OrderedDict()
+    od_move = od.move_to_end
+    od_popitem = od.popitem
+    for pg in pages:
+        if pg in od:
+            od_move(pg)
+            stats.hits += 1
+            continue
+        stats.faults += 1
+        if len(od) >= frames:
+            od_popitem(last=False)
+            stats.evictions += 1
+        od[pg] = None
+    return stats
+
+
+def simulate_clock(pages, frames):
+    """Simulate CLOCK (second chance) replacement over a page-number trace.
+
+    A page->slot dict gives O(1) hit lookup instead of scanning the frame
+    table, so only the eviction sweep ever touches more than one slot.
+    """
+    stats = Stats()
+    frame = array("q", [-1] * frames)
+    refbit = [0] * frames
+    loc = {}
+    hand = 0
+    empty_count = frames
+    for pg in pages:
+        idx = loc.get(pg, -1)
+        if idx != -1:
+            refbit[idx] = 1
+            stats.hits += 1
+            continue
+        stats.faults += 1
+        if empty_count:
+            idx = frames - empty_count
+            empty_count -= 1
+            frame[idx] = pg
+            refbit[idx] = 1
+            loc[pg] = idx
+            continue
+        while refbit[hand]:
+            refbit[hand] = 0
+            hand = (hand + 1) % frames
+        del loc[frame[hand]]
+        frame[hand] = pg
+        refbit[hand] = 1
+        loc[pg] = hand
+        stats.evictions += 1
+        hand = (hand + 1) % frames
+    return stats
+
+
+def print_stats(name, stats, total):
+    out = (f"--- {name} ---\n"
+           f"references: {total}\n"
+           f"hits:       {stats.hits}\n"
+           f"faults:     {stats.faults}\n"
+           f"evictions:  {stats.evictions}\n")
+    if total:
+        out += f"hit rate:   {stats.hits / total:.4f}\n"
+    sys.stdout.write(out)
+
+
+def main(argv):
+    if len(argv) < 3:
+        print(f"usage: {argv[0]} TRACEFILE FRAMES [lru|clock|both]",
+              file=sys.stderr)
+        return 1
+    pages = load_trace(argv[1])
+    frames = int(argv[2])
+    algo = argv[3] if len(argv) > 3 else "both"
+    if algo in ("lru", "both"):
+        print_stats("LRU", simulate_lru(pages, frames), len(pages))
+    if algo in ("clock", "both"):
+        print_stats("CLOCK", simulate_clock(pages, frames), len(pages))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
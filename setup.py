@@ -0,0 +1,17 @@
+"""Builds the optional C extension for memsim.py.
+
+    python3 setup.py build_ext --inplace
+
+Requires Cython; without it (or without the built extension) memsim.py
+runs on its pure-Python simulators.
+"""
+
+from setuptools import Extension, setup
+
+try:
+    from Cython.Build import cythonize
+    ext_modules = cythonize([Extension("_memsim_ext", ["_memsim_ext.pyx"])])
+except ImportError:
+    ext_modules = []
+
+setup(name="memsim-ext", ext_modules=ext_modules)